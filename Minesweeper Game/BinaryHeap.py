@@ -11,12 +11,28 @@ class BinHeap:
     def len(self):
         return self._size
 
+    # Number of elements the heap can hold.
+    def capacity(self):
+        return len(self._data)
+
     def insert(self, new_element):
         self._data[self.len()] = new_element
         self._size = self.len() + 1
         if self.len() > 1:
             self._bubble_up(self.len()-1)
 
+    # Replaces the contents of the heap with the given elements,
+    # restoring the heap property bottom-up in O(n).
+    def heapify(self, elements):
+        elements = list(elements)
+        if len(elements) > len(self._data):
+            print("The elements do not fit in the priority queue")
+            return
+        self._data = elements + [None]*(len(self._data) - len(elements))
+        self._size = len(elements)
+        for elem_index in range(self._size//2 - 1, -1, -1):
+            self._percolate_down(elem_index)
+
     def find_min(self):
         if self.len() == 0:
             print("The priority queue is empty")
@@ -131,6 +147,20 @@ def bin_heap_tests():
     h.insert(7)
     assert h.len() == 10
 
+def heapify_tests():
+    h = BinHeap(10, lambda x, y: x < y)
+    h.heapify([5, 3, 8, 1, 9, 2])
+    assert h.len() == 6
+    out = []
+    while h.len() > 0:
+        out.append(h.find_min())
+        h.remove_min()
+    assert out == [1, 2, 3, 5, 8, 9]
+    h.insert(4)
+    h.heapify([])
+    assert h.len() == 0
+    assert h.capacity() == 10
+
 # Sorts a vector of Xs, given a less-than function for Xs.
 #
 # This function performs a heap sort by inserting all of the
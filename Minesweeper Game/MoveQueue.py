@@ -0,0 +1,106 @@
+# Class implementing the solver's move priority queue on top of BinHeap.
+#
+# Entries are [coords, weight] lists, lowest weight first. Only one entry
+# per coordinate is live: inserting a coordinate which already has an
+# entry with a lower or equal weight is dropped, and inserting one with a
+# lower weight supersedes the old entry. Superseded and discarded entries
+# stay in the heap as stale entries and are skipped when they reach the
+# top. Once stale entries make up more than stale_ratio of the heap, the
+# heap is rebuilt from the live entries in O(n).
+
+from BinaryHeap import BinHeap
+
+class MoveQueue:
+    # Constructs a new move queue for at most capacity distinct
+    # coordinates (rows*columns of the board).
+    def __init__(self, capacity, stale_ratio = 0.5):
+        self._lt = lambda x, y: x[1] < y[1]
+        self._heap = BinHeap(2*capacity + 1, self._lt)
+        self._live = {}
+        self._stale_ratio = stale_ratio
+        self.inserts = 0
+        self.duplicates = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.rebuilds = 0
+        self.max_size = 0
+
+    # Number of live entries, at most one per coordinate.
+    def len(self):
+        return len(self._live)
+
+    # Number of stale entries still stored in the heap.
+    def stale(self):
+        return self._heap.len() - len(self._live)
+
+    # Number of entries stored in the heap, live and stale.
+    def size(self):
+        return self._heap.len()
+
+    def insert(self, new_element):
+        self.inserts += 1
+        coords = new_element[0]
+        current = self._live.get(coords)
+        if current is not None and not self._lt(new_element, current):
+            self.duplicates += 1
+            return
+        if self.stale() > self._stale_ratio*self._heap.len() or self._heap.len() == self._heap.capacity():
+            self._rebuild()
+        self._live[coords] = new_element
+        self._heap.insert(new_element)
+        self.max_size = max(self.max_size, self._heap.len())
+
+    # Marks the entry of a coordinate as stale, used once a tile is
+    # revealed or known to be a mine.
+    def discard(self, coords):
+        self._live.pop(coords, None)
+
+    def find_min(self):
+        self._skip_stale()
+        if self._heap.len() == 0:
+            return None
+        return self._heap.find_min()
+
+    def remove_min(self):
+        self._skip_stale()
+        if self._heap.len() == 0:
+            return
+        self.pops += 1
+        self._live.pop(self._heap.find_min()[0])
+        self._heap.remove_min()
+
+    def _is_live(self, element):
+        return self._live.get(element[0]) is element
+
+    def _skip_stale(self):
+        while self._heap.len() > 0 and not self._is_live(self._heap.find_min()):
+            self.stale_pops += 1
+            self._heap.remove_min()
+
+    def _rebuild(self):
+        self.rebuilds += 1
+        self._heap.heapify(self._live.values())
+
+def move_queue_tests():
+    q = MoveQueue(10)
+    q.insert([(0,0), 2])
+    q.insert([(0,0), 3])
+    assert q.len() == 1
+    assert q.size() == 1
+    q.insert([(0,0), 1])
+    assert q.len() == 1
+    assert q.stale() == 1
+    assert q.find_min() == [(0,0), 1]
+    q.insert([(1,1), 0])
+    q.discard((1,1))
+    assert q.find_min() == [(0,0), 1]
+    assert q.stale() == 1
+    q.remove_min()
+    assert q.len() == 0
+    assert q.find_min() is None
+    for i in range(100):
+        q.insert([(i%10, 0), 100 - i])
+    assert q.len() == 10
+    assert q.size() <= 21
+    assert q.rebuilds > 0
+    assert q.find_min() == [(9,0), 1]
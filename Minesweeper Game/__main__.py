@@ -0,0 +1,7 @@
+# Entry point used when the game directory is run directly: python "Minesweeper Game"
+# Importing minesweeper_game (or any other module in this directory) has no side effects.
+
+from minesweeper_game import play_minesweeper
+
+if __name__ == "__main__":
+    play_minesweeper()
@@ -0,0 +1,359 @@
+import asyncio
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from minesweeper_game import Board
+
+class GameSession:
+    """GameSession represents one game being played on the server, by either a human or a bot.
+
+    Attributes:
+        session_id: Integer identifying the session on the server.
+        board: Board instance the session is played on. Created with verbose set to False so nothing is printed.
+        lost: True once a mine has been revealed in the session.
+        flags: Dictionary containing the coordinates of tiles the player has flagged.
+        lock: asyncio.Lock which ensures that only one request works on the board at a time.
+    """
+    def __init__(self, session_id: int, rows: int, columns: int, num_mines: int):
+        """Constructor for a game session.
+        Arguments:
+            session_id: Integer identifying the session.
+            rows: Number of rows in the board.
+            columns: Number of columns in the board.
+            num_mines: Number of mines in the board.
+        """
+        self.session_id: int = session_id
+        self.board: Board = Board(rows, columns, num_mines, verbose = False)
+        self.lost: bool = False
+        self.flags = {}
+        self.lock = asyncio.Lock()
+
+    def state(self) -> str:
+        """state returns the status of the game as a string, either "playing", "won" or "lost"."""
+
+        if self.lost:
+            return "lost"
+        elif self.board.is_game_won():
+            return "won"
+        else:
+            return "playing"
+
+    def view(self):
+        """view returns the player-observable board, the same information print_board shows.
+        Returns:
+            Doubly nested list where revealed tiles are integers, "X" is a revealed mine, "F" is a flag and "*" is hidden.
+        """
+
+        output = []
+        for row_index, board_row in enumerate(self.board.the_board):
+            view_row = []
+            for column_index, board_tile in enumerate(board_row):
+                if type(board_tile) == int or board_tile == "X":
+                    view_row.append(board_tile)
+                elif (row_index, column_index) in self.flags:
+                    view_row.append("F")
+                else:
+                    view_row.append("*")
+            output.append(view_row)
+        return output
+
+    def reveal(self, coords):
+        """reveal executes a turn at the specified coordinates. Runs inside of the executor.
+        Arguments:
+            coords: Coordinates at which to reveal. Represented as a tuple.
+        """
+
+        if self.state() != "playing":
+            raise ValueError("game is already over")
+        if coords in self.flags:
+            raise ValueError("tile is flagged")
+        if type(self.board.the_board[coords[0]][coords[1]]) == int:
+            raise ValueError("tile is already revealed")
+
+        self.lost = self.board.play_turn(coords)
+
+    def hint(self):
+        """hint asks the solver for the next move, never suggesting a flagged tile. Runs inside of the executor.
+        Returns:
+            Tuple representation of coordinates (x,y)
+        """
+
+        if self.state() != "playing":
+            raise ValueError("game is already over")
+
+        #The solver has no information before the first turn, so the opening move is suggested unless it is flagged
+        if self.board.turn_count == 0 and self.board.opening_move() not in self.flags:
+            return self.board.opening_move()
+        elif self.board.turn_count == 0:
+            coords = self.board.guess_move(self.flags)
+        else:
+            coords = self.board.find_play(self.flags)
+
+        if coords == None:
+            raise ValueError("every playable tile is flagged")
+        return coords
+
+    def step(self):
+        """step asks the solver for the next move and plays it. Runs inside of the executor.
+        Returns:
+            Tuple representation of the coordinates that were played.
+        """
+
+        coords = self.hint()
+        self.reveal(coords)
+        return coords
+
+class GameServer:
+    """GameServer hosts many minesweeper sessions in one process over a newline delimited JSON protocol on TCP.
+
+    Each request is one line containing a JSON object with an "op" key, and each response is one line containing
+    a JSON object with an "ok" key. Coordinates are 0-indexed "row" and "column" keys. Supported ops:
+        new: Creates a session with optional "rows", "columns" and "mines". Responds with "session".
+        reveal: Reveals the tile at "row", "column" in "session".
+        flag: Toggles a flag on the tile at "row", "column" in "session".
+        hint: Responds with the solver's next move in "session" as "row", "column".
+        step: Plays the solver's next move in "session".
+        view: Responds with the board and state of "session".
+        close: Removes "session" from the server.
+
+    Board work runs in a thread pool executor so that a slow solve does not stall the event loop, and each
+    session's lock keeps requests to the same session in order.
+
+    Attributes:
+        sessions: Dictionary mapping session ids to GameSession instances.
+        executor: ThreadPoolExecutor which runs the board and solver work.
+    """
+    def __init__(self, max_workers: int = None):
+        """Constructor for the game server.
+        Arguments:
+            max_workers: Number of executor threads. Defaults to None, which lets ThreadPoolExecutor decide.
+        """
+        self.sessions = {}
+        self.executor = ThreadPoolExecutor(max_workers)
+        self._session_ids = itertools.count(1)
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """start begins listening for clients.
+        Arguments:
+            host: Defaults to loopback.
+            port: Defaults to 0, which picks a free port.
+        Returns:
+            The port the server is listening on.
+        """
+
+        self._server = await asyncio.start_server(self.handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """serve_forever runs the server until it is cancelled."""
+
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """stop closes the listening socket and shuts down the executor."""
+
+        self._server.close()
+        await self._server.wait_closed()
+        self.executor.shutdown(wait = False)
+
+    async def handle_client(self, reader, writer):
+        """handle_client answers requests from one connection until it is closed.
+        Arguments:
+            reader: asyncio.StreamReader of the connection.
+            writer: asyncio.StreamWriter of the connection.
+        """
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except (ValueError, KeyError, TypeError, IndexError, ArithmeticError) as error:
+                    response = {"ok": False, "error": str(error)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request):
+        """handle_request carries out one request.
+        Arguments:
+            request: Dictionary decoded from the request line.
+        Returns:
+            Dictionary to be sent back as the response.
+        """
+
+        op = request["op"]
+        if op not in ("new", "reveal", "flag", "hint", "step", "view", "close"):
+            raise ValueError(f"unknown op {op}")
+
+        if op == "new":
+            rows = int(request.get("rows", 9))
+            columns = int(request.get("columns", 9))
+            num_mines = int(request.get("mines", 10))
+            if rows < 1 or columns < 1 or num_mines < 0 or num_mines >= rows*columns:
+                raise ValueError("invalid board size")
+
+            #Mine placement is proportional to the board size, so it is done in the executor as well
+            session_id = next(self._session_ids)
+            loop = asyncio.get_running_loop()
+            session = await loop.run_in_executor(self.executor, GameSession, session_id, rows, columns, num_mines)
+            self.sessions[session_id] = session
+            return {"ok": True, "session": session_id, "state": session.state()}
+
+        session = self.sessions.get(request.get("session"))
+        if session == None:
+            raise ValueError("unknown session")
+
+        if op == "close":
+            self.sessions.pop(session.session_id)
+            return {"ok": True}
+
+        async with session.lock:
+            if op == "view":
+                return {"ok": True, "state": session.state(), "board": session.view()}
+
+            elif op == "flag":
+                coords = self._request_coords(session, request)
+                if coords in session.flags:
+                    session.flags.pop(coords)
+                else:
+                    session.flags[coords] = None
+                return {"ok": True, "state": session.state(), "flagged": coords in session.flags}
+
+            elif op == "reveal":
+                coords = self._request_coords(session, request)
+                await self._run(session.reveal, coords)
+                return {"ok": True, "state": session.state(), "board": session.view()}
+
+            elif op == "hint":
+                coords = await self._run(session.hint)
+                return {"ok": True, "row": coords[0], "column": coords[1]}
+
+            elif op == "step":
+                coords = await self._run(session.step)
+                return {"ok": True, "row": coords[0], "column": coords[1], "state": session.state()}
+
+        raise ValueError(f"unknown op {op}")
+
+    async def _run(self, function, *args):
+        """_run runs a function in the executor and waits for its result."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    def _request_coords(self, session, request):
+        """_request_coords obtains the coordinates of a request and ensures they are within the bounds of the board."""
+
+        coords = (int(request["row"]), int(request["column"]))
+        if coords[0] < 0 or coords[0] >= session.board.rows or coords[1] < 0 or coords[1] >= session.board.columns:
+            raise ValueError("coordinates out of bounds")
+        return coords
+
+class GameClient:
+    """GameClient is a loopback client for GameServer, sending one request at a time over a single connection."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 0):
+        """connect opens a connection to a GameServer.
+        Returns:
+            GameClient instance.
+        """
+
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **fields):
+        """request sends a request and waits for its response.
+        Arguments:
+            op: Name of the request, see GameServer.
+            fields: Remaining keys of the request.
+        Returns:
+            Dictionary decoded from the response line.
+        """
+
+        fields["op"] = op
+        self._writer.write(json.dumps(fields).encode() + b"\n")
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def close(self):
+        """close closes the connection."""
+
+        self._writer.close()
+        await self._writer.wait_closed()
+
+async def _game_server_round_trip():
+    """_game_server_round_trip plays a session over a loopback connection, checking the replies to each op."""
+
+    server = GameServer(max_workers = 2)
+    port = await server.start()
+    client = await GameClient.connect(port = port)
+    try:
+        response = await client.request("new", rows = 9, columns = 9, mines = 10)
+        assert response["ok"] and response["state"] == "playing"
+        session = response["session"]
+
+        #The first hint is the opening move, and a flagged tile is never hinted or played
+        hint = await client.request("hint", session = session)
+        assert hint["ok"]
+        response = await client.request("flag", session = session, row = hint["row"], column = hint["column"])
+        assert response["ok"] and response["flagged"]
+        response = await client.request("reveal", session = session, row = hint["row"], column = hint["column"])
+        assert not response["ok"] and response["error"] == "tile is flagged"
+        response = await client.request("hint", session = session)
+        assert response["ok"] and (response["row"], response["column"]) != (hint["row"], hint["column"])
+        response = await client.request("flag", session = session, row = hint["row"], column = hint["column"])
+        assert response["ok"] and not response["flagged"]
+
+        response = await client.request("reveal", session = session, row = hint["row"], column = hint["column"])
+        assert response["ok"] and response["board"][hint["row"]][hint["column"]] not in ("*", "X")
+        while response["state"] == "playing":
+            response = await client.request("step", session = session)
+            assert response["ok"]
+        response = await client.request("view", session = session)
+        assert response["ok"] and response["state"] in ("won", "lost")
+        response = await client.request("step", session = session)
+        assert not response["ok"] and response["error"] == "game is already over"
+
+        #Every bad request gets an error reply and the connection stays open
+        bad_requests = [
+            {"op": "bogus"},
+            {"op": "new", "rows": 1e400},
+            {"op": "new", "rows": 3, "columns": 3, "mines": 9},
+            {"op": "reveal", "session": session, "row": 9, "column": 0},
+            {"op": "view", "session": -1},
+        ]
+        for request in bad_requests:
+            response = await client.request(**request)
+            assert not response["ok"] and response["error"], request
+
+        response = await client.request("close", session = session)
+        assert response["ok"] and session not in server.sessions
+    finally:
+        await client.close()
+        await server.stop()
+
+def game_server_tests():
+    asyncio.run(_game_server_round_trip())
+
+async def serve(host: str = "127.0.0.1", port: int = 8765):
+    """serve runs a GameServer until interrupted."""
+
+    server = GameServer()
+    port = await server.start(host, port)
+    print(f"Serving minesweeper on {host}:{port}")
+    await server.serve_forever()
+
+if __name__ == "__main__":
+    asyncio.run(serve())
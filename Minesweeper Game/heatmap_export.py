@@ -0,0 +1,160 @@
+import array
+import json
+import os
+import sys
+from minesweeper_game import Board
+
+#array typecodes of each heatmap column and the matching .npy dtype
+COLUMN_TYPES = {
+    "value": ("b", "|i1"),
+    "weight": ("d", "<f8"),
+    "known_safe": ("B", "|b1"),
+    "known_mine": ("B", "|b1"),
+    "probability": ("d", "<f8"),
+    "is_mine": ("B", "|b1"),
+}
+
+def write_npy(path, values, shape, dtype):
+    """write_npy writes an array.array to a .npy file (format version 1.0) which numpy.load can read, without needing NumPy.
+    Arguments:
+        path: Path of the file to write.
+        values: array.array holding the values in row-major order.
+        shape: Tuple shape of the array.
+        dtype: .npy dtype string matching the typecode of values, for example "<f8".
+    """
+
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': %r, }" % (dtype, tuple(shape))
+
+    #The header is padded with spaces and a newline so that the data starts on a multiple of 64 bytes
+    header += " "*(63 - (10 + len(header)) % 64) + "\n"
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    with open(path, "wb") as npy_file:
+        npy_file.write(b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1"))
+        values.tofile(npy_file)
+
+class HeatmapRecorder:
+    """HeatmapRecorder collects Board.heatmap columns from many game states of one board size for export.
+
+    Attributes:
+        rows: Number of rows of the recorded boards.
+        columns: Number of columns of the recorded boards.
+        estimator: Optional estimator passed through to Board.heatmap.
+        data: Dictionary mapping each column name to an array.array of values, one per tile of every recorded state.
+        games: array.array containing the game number of each recorded state.
+        turns: array.array containing the turn count of each recorded state.
+    """
+    def __init__(self, rows: int, columns: int, estimator = None):
+        self.rows: int = rows
+        self.columns: int = columns
+        self.estimator = estimator
+        names = ["value", "weight", "known_safe", "known_mine"] + (["probability"] if estimator != None else []) + ["is_mine"]
+        self.data = {name: array.array(COLUMN_TYPES[name][0]) for name in names}
+        self.games = array.array("l")
+        self.turns = array.array("l")
+
+    def __len__(self):
+        return len(self.games)
+
+    def add(self, board, game = 0):
+        """add records the current state of a board.
+        Arguments:
+            board: Board instance with the same size as the recorder.
+            game: Defaults to 0, number identifying the game the state belongs to.
+        """
+
+        if board.rows != self.rows or board.columns != self.columns:
+            raise ValueError("board size does not match the recorder")
+
+        heatmap = board.heatmap(self.estimator)
+        heatmap["is_mine"] = [(row_index, column_index) in board.mine_coords
+                              for row_index in range(self.rows) for column_index in range(self.columns)]
+        for name, values in self.data.items():
+            values.extend(heatmap[name])
+        self.games.append(game)
+        self.turns.append(board.turn_count)
+
+    def export_npy(self, directory):
+        """export_npy writes one .npy file per column, shaped (states, rows, columns), plus game.npy and turn.npy shaped (states,).
+        Arguments:
+            directory: Directory to write the files to, created if it does not exist.
+        """
+
+        os.makedirs(directory, exist_ok = True)
+        shape = (len(self), self.rows, self.columns)
+        for name, values in self.data.items():
+            write_npy(os.path.join(directory, name + ".npy"), values, shape, COLUMN_TYPES[name][1])
+        for name, values in (("game", self.games), ("turn", self.turns)):
+            write_npy(os.path.join(directory, name + ".npy"), array.array("q", values), (len(self),), "<i8")
+        with open(os.path.join(directory, "schema.json"), "w") as schema_file:
+            json.dump({"rows": self.rows, "columns": self.columns, "states": len(self),
+                       "columns_written": list(self.data) + ["game", "turn"]}, schema_file)
+
+    def export_parquet(self, path):
+        """export_parquet writes a Parquet file with one row per tile of every recorded state. Requires pyarrow.
+        Arguments:
+            path: Path of the file to write.
+        """
+
+        #Imported here as pyarrow is only needed for this export
+        import pyarrow
+        import pyarrow.parquet
+
+        tiles = self.rows*self.columns
+        table = {
+            "game": [game for game in self.games for _ in range(tiles)],
+            "turn": [turn for turn in self.turns for _ in range(tiles)],
+            "row": [tile // self.columns for _ in self.games for tile in range(tiles)],
+            "column": [tile % self.columns for _ in self.games for tile in range(tiles)],
+        }
+        for name, values in self.data.items():
+            table[name] = [bool(value) for value in values] if COLUMN_TYPES[name][0] == "B" else values.tolist()
+        pyarrow.parquet.write_table(pyarrow.table(table), path)
+
+def record_games(rows, columns, num_mines, games, seed = 0, estimator = None):
+    """record_games plays seeded games with the solver, recording the state the solver sees before each of its moves.
+    Arguments:
+        rows, columns, num_mines: Board configuration.
+        games: Number of games to play.
+        seed: Defaults to 0. Game i is played on the board seeded with seed + i.
+        estimator: Optional estimator passed through to Board.heatmap.
+    Returns:
+        HeatmapRecorder containing the recorded states.
+    """
+
+    recorder = HeatmapRecorder(rows, columns, estimator)
+    for game_index in range(games):
+        board = Board(rows, columns, num_mines, verbose = False, seed = seed + game_index)
+        lost = board.play_turn(board.opening_move())
+        while not lost and not board.is_game_won():
+            recorder.add(board, game_index)
+
+            lost = board.play_turn(board.find_play())
+    return recorder
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description = "Exports the solver's per-tile assessment of many game states.")
+    parser.add_argument("--rows", type = int, default = 9)
+    parser.add_argument("--columns", type = int, default = 9)
+    parser.add_argument("--mines", type = int, default = 10)
+    parser.add_argument("--games", type = int, default = 100)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--sampling", action = "store_true",
+                        help = "add a mine probability column estimated by mine_sampler (requires NumPy)")
+    parser.add_argument("--npy", default = None, help = "directory to write .npy columns to")
+    parser.add_argument("--parquet", default = None, help = "path of a Parquet file to write (requires pyarrow)")
+    args = parser.parse_args()
+
+    estimator = None
+    if args.sampling:
+        from mine_sampler import sampling_estimator
+        estimator = sampling_estimator(seed = args.seed)
+
+    recorder = record_games(args.rows, args.columns, args.mines, args.games, args.seed, estimator)
+    print(f"Recorded {len(recorder)} states from {args.games} games")
+    if args.npy:
+        recorder.export_npy(args.npy)
+    if args.parquet:
+        recorder.export_parquet(args.parquet)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from game_server import GameServer, GameClient
+
+def percentile(values, percent):
+    """percentile returns the nearest-rank percentile of a list of values.
+    Arguments:
+        values: List of numbers.
+        percent: Percentile to obtain, between 0 and 100.
+    Returns:
+        The value at the requested percentile, or None if values is empty.
+    """
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered)*percent//100))
+    return ordered[int(rank) - 1]
+
+async def bot_player(port, games, rows, columns, mines, latencies, results):
+    """bot_player plays games on the server with the solver, recording the latency of every move.
+    Arguments:
+        port: Port of the server on loopback.
+        games: Number of games to play.
+        rows, columns, mines: Board configuration of each game.
+        latencies: List to which the latency of each move (in seconds) is appended.
+        results: Dictionary counting the final state of each game.
+    """
+
+    client = await GameClient.connect(port = port)
+    for _ in range(games):
+        session = (await client.request("new", rows = rows, columns = columns, mines = mines))["session"]
+        state = "playing"
+        while state == "playing":
+            start = time.perf_counter()
+            response = await client.request("step", session = session)
+            latencies.append(time.perf_counter() - start)
+            state = response["state"] if response["ok"] else "error"
+        results[state] = results.get(state, 0) + 1
+        await client.request("close", session = session)
+    await client.close()
+
+async def run_load(clients: int = 50, games: int = 4, rows: int = 9, columns: int = 9, mines: int = 10, workers: int = None):
+    """run_load starts a server on loopback and has many bots play on it at once.
+    Arguments:
+        clients: Number of concurrent connections.
+        games: Number of games played by each connection.
+        rows, columns, mines: Board configuration of each game.
+        workers: Number of executor threads on the server.
+    Returns:
+        Dictionary containing move count, throughput, p50/p99 move latency in milliseconds and game results.
+    """
+
+    server = GameServer(workers)
+    port = await server.start()
+    latencies = []
+    results = {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bot_player(port, games, rows, columns, mines, latencies, results) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await server.stop()
+
+    return {
+        "moves": len(latencies),
+        "seconds": elapsed,
+        "moves_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50)*1000,
+        "p99_ms": percentile(latencies, 99)*1000,
+        "results": results,
+    }
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description = "Load generator for the minesweeper game server.")
+    parser.add_argument("--clients", type = int, default = 50)
+    parser.add_argument("--games", type = int, default = 4)
+    parser.add_argument("--rows", type = int, default = 9)
+    parser.add_argument("--columns", type = int, default = 9)
+    parser.add_argument("--mines", type = int, default = 10)
+    parser.add_argument("--workers", type = int, default = None)
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.clients, args.games, args.rows, args.columns, args.mines, args.workers))
+    print(f"moves: {report['moves']} in {report['seconds']:.2f}s ({report['moves_per_second']:.0f} moves/s)")
+    print(f"p50 move latency: {report['p50_ms']:.2f} ms")
+    print(f"p99 move latency: {report['p99_ms']:.2f} ms")
+    print(f"results: {report['results']}")
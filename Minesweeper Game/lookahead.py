@@ -0,0 +1,122 @@
+from mine_sampler import sample_probabilities
+
+class GuessEvaluation:
+    """GuessEvaluation holds the lookahead score of one candidate guess.
+
+    Attributes:
+        coords: Coordinates of the candidate tile.
+        probability: Estimated mine probability of the tile.
+        expected_safe: Expected number of other tiles which are certain to be safe after the tile is revealed, over the
+                       numbers it can reveal.
+        next_survival: Probability of surviving the move after the guess, which is certain if the revealed number leaves
+                       a safe tile and otherwise a guess at the least likely mine.
+        score: Score the candidates are ranked by, higher is better.
+    """
+    def __init__(self, coords, probability: float, expected_safe: float, next_survival: float, score: float):
+        self.coords = coords
+        self.probability: float = probability
+        self.expected_safe: float = expected_safe
+        self.next_survival: float = next_survival
+        self.score: float = score
+
+def evaluate_guesses(board, plies = 2, tolerance = 0.03, max_candidates = 10, min_branch_samples = 10, **sampler_options):
+    """evaluate_guesses scores the hidden tiles least likely to be a mine by simulating the numbers they can reveal.
+
+    The mine layouts sampled by mine_sampler are shared by every candidate. Revealing a candidate branches the samples by
+    the number it would show, so each branch is a row mask over the same array instead of a copy of the board. In each
+    branch, tiles which are not a mine in any of its samples are counted as safe moves. A small branch makes tiles look
+    safe by chance, so branches with fewer than min_branch_samples samples count no safe moves, and the guess after them
+    is judged by the mine probabilities over all samples.
+    Arguments:
+        board: Board instance.
+        plies: Defaults to 2. With 1, a candidate scores its survival times one plus its expected safe moves. With 2, it
+               scores the probability of surviving both the guess and the move after it, ties broken by expected safe moves.
+        tolerance: Defaults to 0.03, how much more likely than the safest tile to be a mine a candidate may be.
+        max_candidates: Defaults to 10, the number of candidates evaluated, preferring tiles with fewer neighbours.
+        min_branch_samples: Defaults to 10.
+        sampler_options: Keyword arguments passed through to sample_probabilities.
+    Returns:
+        List of GuessEvaluation instances, best first. Empty if the sampled estimate is not reliable.
+    """
+
+    #Imported here so that NumPy is only needed when lookahead is selected
+    import numpy as np
+
+    #Without enough consistent layouts the branches are too small to compare, so the caller falls back to its own guess
+    estimate = sample_probabilities(board, keep_samples = True, **sampler_options)
+    hidden = estimate.frontier + estimate.interior
+    if not hidden or not estimate.reliable or len(estimate.interior_mines) == 0:
+        return []
+    num_samples = len(estimate.interior_mines)
+
+    #Full layouts of the hidden tiles, spreading each sample's interior mines uniformly over the interior tiles
+    rng = np.random.default_rng(sampler_options.get("seed"))
+    interior_layouts = rng.random((num_samples, len(estimate.interior))).argsort(axis = 1) < estimate.interior_mines[:, None]
+    layouts = np.concatenate([estimate.configurations, interior_layouts], axis = 1)
+    probabilities = layouts.mean(axis = 0)
+
+    hidden_index = {coords: index for index, coords in enumerate(hidden)}
+    neighbours = [[hidden_index[each_tile] for each_tile in board.indices_around_coord(coords) if each_tile in hidden_index]
+                  for coords in hidden]
+
+    #Candidates are the tiles close to the lowest mine probability, preferring tiles with fewer hidden neighbours
+    order = sorted(range(len(hidden)), key = lambda index: (probabilities[index], len(neighbours[index]), hidden[index]))
+    lowest = probabilities[order[0]]
+    candidates = [index for index in order if probabilities[index] <= lowest + tolerance][:max_candidates]
+
+    evaluations = []
+    for index in candidates:
+        safe = ~layouts[:, index]
+        num_safe = safe.sum()
+        numbers = layouts[:, neighbours[index]].sum(axis = 1)
+        expected_safe = 0.0
+        next_survival = 0.0
+        other_probabilities = probabilities.copy()
+        other_probabilities[index] = 1.0
+
+        for number in np.unique(numbers[safe]):
+            branch = safe & (numbers == number)
+            weight = branch.sum() / num_safe
+            branch_probabilities = layouts[branch].mean(axis = 0)
+            branch_probabilities[index] = 1.0
+
+            #Once the candidate is revealed with no other hidden tile left but mines, the game is won
+            if branch_probabilities.min() == 1.0:
+                next_survival += weight
+                continue
+
+            #A small branch makes tiles look safe by chance, so its next guess is judged by all the samples instead
+            if branch.sum() < min_branch_samples:
+                next_survival += weight*(1.0 - other_probabilities.min())
+                continue
+
+            safe_moves = int((branch_probabilities == 0).sum())
+            expected_safe += weight*safe_moves
+            next_survival += weight*(1.0 if safe_moves > 0 else 1.0 - branch_probabilities.min())
+
+        survival = 1.0 - probabilities[index]
+        score = survival*(1.0 + expected_safe) if plies == 1 else survival*next_survival
+        evaluations.append(GuessEvaluation(hidden[index], float(probabilities[index]), float(expected_safe),
+                                           float(next_survival), float(score)))
+
+    evaluations.sort(key = lambda evaluation: (-evaluation.score, -evaluation.expected_safe, evaluation.probability, evaluation.coords))
+    return evaluations
+
+def select_guess(board, **options):
+    """select_guess returns the coordinates of the best guess from evaluate_guesses, or None if there is no evaluation.
+    Arguments:
+        options: Keyword arguments passed through to evaluate_guesses.
+    """
+
+    evaluations = evaluate_guesses(board, **options)
+    return evaluations[0].coords if evaluations else None
+
+def lookahead_selector(**options):
+    """lookahead_selector returns a guess selector for Board, which maps a board to the coordinates select_guess picks.
+    Arguments:
+        options: Keyword arguments passed through to evaluate_guesses.
+    """
+
+    def selector(board):
+        return select_guess(board, **options)
+    return selector
@@ -0,0 +1,234 @@
+import math
+
+def board_constraints(board):
+    """board_constraints collects what the revealed integers of a board say about the hidden tiles.
+
+    Tiles in marked_mines are treated as known mines, since find_mines only marks tiles which must be mines.
+    Arguments:
+        board: Board instance.
+    Returns:
+        Tuple containing:
+            frontier: List of coordinates of hidden tiles next to at least one revealed integer.
+            constraints: List of (remaining mines, list of frontier indices) for every revealed integer with hidden neighbours.
+            interior: List of coordinates of the other hidden tiles, which no revealed integer says anything about.
+            remaining: Number of mines left among the frontier and interior tiles.
+    """
+
+    frontier_index = {}
+    constraints = []
+    for row_index, board_row in enumerate(board.the_board):
+        for column_index, board_tile in enumerate(board_row):
+            if type(board_tile) != int:
+                continue
+            unknown = []
+            remaining = board_tile
+            for each_tile in board.indices_around_coord((row_index, column_index)):
+                if each_tile in board.marked_mines:
+                    remaining -= 1
+                elif type(board.the_board[each_tile[0]][each_tile[1]]) == list:
+                    unknown.append(frontier_index.setdefault(each_tile, len(frontier_index)))
+            if unknown:
+                constraints.append((remaining, unknown))
+
+    interior = [(row_index, column_index) for row_index, board_row in enumerate(board.the_board)
+                for column_index, board_tile in enumerate(board_row)
+                if type(board_tile) == list and (row_index, column_index) not in board.marked_mines
+                and (row_index, column_index) not in frontier_index]
+    return list(frontier_index), constraints, interior, board.num_mines - len(board.marked_mines)
+
+class ProbabilityEstimate:
+    """ProbabilityEstimate holds the mine probability of every hidden tile estimated by sample_probabilities.
+
+    Attributes:
+        probabilities: Dictionary mapping hidden tile coordinates to their estimated mine probability.
+                       Tiles in marked_mines have probability 1. Empty if no consistent configuration was sampled.
+        errors: Dictionary mapping the same coordinates to the standard error of the estimate, nan if it is unknown.
+        samples: Number of sampled configurations consistent with every revealed integer and the mine count. This is what
+                 the precision of the estimate depends on, and can be far lower than the samples requested.
+        proposals: Number of moves proposed across all chains, the cost of the estimate.
+        reliable: False if fewer than the minimum number of consistent configurations were sampled within the sweep limit.
+        frontier: List of coordinates of the frontier tiles, see board_constraints.
+        interior: List of coordinates of the interior tiles, see board_constraints.
+        configurations: With keep_samples, NumPy bool array with one row per sample marking the mines among the frontier tiles.
+        interior_mines: With keep_samples, NumPy array of the number of interior mines of each sample.
+    """
+    def __init__(self, probabilities, errors, samples: int, proposals: int, frontier = None, interior = None,
+                 configurations = None, interior_mines = None, reliable: bool = True):
+        self.probabilities = probabilities
+        self.errors = errors
+        self.samples: int = samples
+        self.proposals: int = proposals
+        self.reliable: bool = reliable
+        self.frontier = frontier
+        self.interior = interior
+        self.configurations = configurations
+        self.interior_mines = interior_mines
+
+def sample_probabilities(board, samples = 2000, chains = 64, burn_in = 20, beta = 2.0, seed = None, keep_samples = False,
+                         min_samples = 500, max_sweeps = None):
+    """sample_probabilities estimates the mine probability of every hidden tile by sampling mine configurations consistent
+    with all revealed integers and the global mine count, using Markov chain Monte Carlo vectorized with NumPy.
+
+    Each chain holds a mine configuration of the frontier tiles plus a count of mines among the interior tiles, which are
+    interchangeable. A configuration with k interior mines stands for C(interior, k) layouts, and configurations which
+    break revealed integers are allowed but penalised by exp(-beta*violation), so the chains can move between the
+    consistent configurations. Only consistent configurations are counted, which are then drawn in proportion to the
+    number of layouts they stand for, as in a uniformly drawn board. Moves either flip a frontier tile (moving a mine to or
+    from the interior) or swap a frontier tile with another frontier tile, sweeping the frontier tiles in random order.
+    Error bars are the standard error of the per-chain averages.
+
+    On boards with many revealed integers, most recorded sweeps break at least one of them, so only a fraction of the
+    requested samples are consistent. The chains then keep sweeping until min_samples consistent configurations are
+    recorded or max_sweeps is reached. Raising beta instead makes more sweeps consistent, but the chains then rarely
+    leave the configuration they are in and the estimate gets worse.
+    Arguments:
+        board: Board instance.
+        samples: Defaults to 2000, the number of sweeps recorded across all chains when they are all consistent.
+        chains: Defaults to 64, the number of chains run side by side.
+        burn_in: Defaults to 20, the number of sweeps each chain makes before recording.
+        beta: Defaults to 2.0, the penalty for each mine a revealed integer is off by.
+        seed: Defaults to None, seed of the NumPy random generator.
+        keep_samples: Defaults to False. If True, the sampled configurations are kept in the estimate, as used by lookahead.py.
+        min_samples: Defaults to 500, the number of consistent configurations below which sweeping continues.
+        max_sweeps: Defaults to 10 times the sweeps needed for samples, the most sweeps each chain makes. Bounds the
+                    cost of the estimate, which is marked as not reliable if min_samples was not reached.
+    Returns:
+        ProbabilityEstimate instance.
+    """
+
+    #Imported here so that NumPy is only needed when the sampling estimator is selected
+    import numpy as np
+
+    frontier, constraints, interior, remaining = board_constraints(board)
+    num_frontier = len(frontier)
+    num_interior = len(interior)
+    known = {coords: 1.0 for coords in board.marked_mines}
+
+    #Without revealed integers next to hidden tiles, every hidden tile is equally likely to be a mine
+    if num_frontier == 0:
+        probability = remaining / num_interior if num_interior else 0.0
+        estimate = ProbabilityEstimate({**{coords: probability for coords in interior}, **known},
+                                       {**{coords: 0.0 for coords in interior}, **{coords: 0.0 for coords in known}}, 0, 0,
+                                       frontier, interior)
+        if keep_samples:
+            estimate.configurations = np.zeros((samples, 0), dtype = bool)
+            estimate.interior_mines = np.full(samples, remaining)
+        return estimate
+
+    rng = np.random.default_rng(seed)
+    matrix = np.zeros((num_frontier, len(constraints)), dtype = np.int32)
+    values = np.array([value for value, _ in constraints], dtype = np.int32)
+    for constraint_index, (_, tiles) in enumerate(constraints):
+        matrix[tiles, constraint_index] = 1
+
+    #Log of C(interior, k) for every possible number k of interior mines
+    log_layouts = np.array([math.lgamma(num_interior + 1) - math.lgamma(k + 1) - math.lgamma(num_interior - k + 1)
+                            for k in range(num_interior + 1)])
+
+    #Starting configurations place the remaining mines uniformly at random over all frontier and interior tiles
+    order = rng.random((chains, num_frontier + num_interior)).argsort(axis = 1) < remaining
+    state = order[:, :num_frontier].copy()
+    interior_mines = order[:, num_frontier:].sum(axis = 1)
+    counts = state.astype(np.int32) @ matrix
+    violation = np.abs(counts - values).sum(axis = 1)
+
+    chain_index = np.arange(chains)
+    sweeps = burn_in + math.ceil(samples / chains)
+    if max_sweeps == None:
+        max_sweeps = 10*sweeps
+    sums = np.zeros((chains, num_frontier))
+    interior_sums = np.zeros(chains)
+    recorded = np.zeros(chains)
+    kept_configurations = []
+    kept_interior_mines = []
+
+    sweep = 0
+    while sweep < sweeps or (recorded.sum() < min_samples and sweep < max_sweeps):
+        for tile in rng.permutation(num_frontier):
+
+            #Flip move: the tile changes state and a mine moves to or from the interior to keep the mine count
+            change = np.where(state[:, tile], -1, 1)
+            new_interior_mines = interior_mines - change
+            new_counts = counts + change[:, None]*matrix[tile]
+            new_violation = np.abs(new_counts - values).sum(axis = 1)
+            allowed = (new_interior_mines >= 0) & (new_interior_mines <= num_interior)
+            log_ratio = (log_layouts[np.clip(new_interior_mines, 0, num_interior)] - log_layouts[interior_mines]
+                         - beta*(new_violation - violation))
+            accept = allowed & (np.log(rng.random(chains)) < log_ratio)
+            state[accept, tile] = ~state[accept, tile]
+            interior_mines = np.where(accept, new_interior_mines, interior_mines)
+            counts = np.where(accept[:, None], new_counts, counts)
+            violation = np.where(accept, new_violation, violation)
+
+            #Swap move: the tile trades states with a random frontier tile, keeping the number of frontier mines
+            partner = rng.integers(num_frontier, size = chains)
+            differs = state[chain_index, partner] != state[:, tile]
+            change = np.where(state[:, tile], -1, 1)
+            new_counts = counts + change[:, None]*(matrix[tile] - matrix[partner])
+            new_violation = np.abs(new_counts - values).sum(axis = 1)
+            accept = differs & (np.log(rng.random(chains)) < -beta*(new_violation - violation))
+            state[accept, tile] = ~state[accept, tile]
+            state[chain_index[accept], partner[accept]] = ~state[chain_index[accept], partner[accept]]
+            counts = np.where(accept[:, None], new_counts, counts)
+            violation = np.where(accept, new_violation, violation)
+
+        #Records the configuration of every chain which currently satisfies every revealed integer
+        if sweep >= burn_in:
+            consistent = violation == 0
+            sums[consistent] += state[consistent]
+            interior_sums[consistent] += interior_mines[consistent]
+            recorded[consistent] += 1
+            if keep_samples:
+                kept_configurations.append(state[consistent])
+                kept_interior_mines.append(interior_mines[consistent])
+        sweep += 1
+
+    proposals = 2*sweep*num_frontier*chains
+    total = int(recorded.sum())
+    if total == 0:
+        estimate = ProbabilityEstimate({}, {}, 0, proposals, frontier, interior, reliable = False)
+        if keep_samples:
+            estimate.configurations = np.zeros((0, num_frontier), dtype = bool)
+            estimate.interior_mines = np.zeros(0, dtype = int)
+        return estimate
+
+    frontier_probabilities = sums.sum(axis = 0) / total
+    interior_probability = interior_sums.sum() / total / num_interior if num_interior else 0.0
+
+    #Standard error from the spread of the per-chain averages, over the chains which recorded anything
+    used = recorded > 0
+    if used.sum() > 1:
+        chain_frontier = sums[used] / recorded[used][:, None]
+        frontier_errors = chain_frontier.std(axis = 0, ddof = 1) / math.sqrt(used.sum())
+        chain_interior = interior_sums[used] / recorded[used] / max(num_interior, 1)
+        interior_error = chain_interior.std(ddof = 1) / math.sqrt(used.sum())
+    else:
+        frontier_errors = np.full(num_frontier, float("nan"))
+        interior_error = float("nan")
+
+    probabilities = dict(known)
+    errors = {coords: 0.0 for coords in known}
+    for index, coords in enumerate(frontier):
+        probabilities[coords] = float(frontier_probabilities[index])
+        errors[coords] = float(frontier_errors[index])
+    for coords in interior:
+        probabilities[coords] = float(interior_probability)
+        errors[coords] = float(interior_error)
+    estimate = ProbabilityEstimate(probabilities, errors, total, proposals, frontier, interior, reliable = total >= min_samples)
+    if keep_samples:
+        estimate.configurations = np.concatenate(kept_configurations)
+        estimate.interior_mines = np.concatenate(kept_interior_mines)
+    return estimate
+
+def sampling_estimator(**options):
+    """sampling_estimator returns an estimator for Board.heatmap and Board's probability_estimator, which maps a board
+    to the probabilities of sample_probabilities. Estimates which are not reliable map to no probabilities, so that
+    Board falls back to its own weights.
+    Arguments:
+        options: Keyword arguments passed through to sample_probabilities.
+    """
+
+    def estimator(board):
+        estimate = sample_probabilities(board, **options)
+        return estimate.probabilities if estimate.reliable else {}
+    return estimator
@@ -1,6 +1,6 @@
 import random
 import itertools
-from BinaryHeap import BinHeap
+from MoveQueue import MoveQueue
 
 class Board:
     """Board represents a minesweeper game instance.
@@ -15,30 +15,53 @@ class Board:
                     and each row element has column count elements. Each board index has the value -1 assigned indicating that
                     it is has yet to be modified.
         mine_coords: Dictionary containing coordinates of every single mine within the board. Initially empty, filled when mines are placed.
-        move_priority_queue: Priority queue represented as a minHeap which stores all potential plays. Initially empty, filled after intial play.
+        move_priority_queue: MoveQueue (a minHeap keeping one live entry per tile) which stores all potential plays. Initially empty, filled after intial play.
         marked_mines: Dictionary containing coordinates of what the AI has determined to be the location of a mine. Initially empty, filled after mines are discovered.
         int_coords: List containing the coordinates of all the visible integers within the game. Initially empty, filled as integers are discovered.
         no_mines: Dictionary containing the coordinates of tiles at which the AI determined it impossible for there to be mines.
+        verbose: If False, the board and solver do not print anything. Used when boards are driven by a program instead of a player.
+        random: random.Random instance used to place mines. Seeded with the seed passed to the constructor.
+        opening_book: Opening book entry for the board's configuration (see opening_book.py), or None. Chooses the first move.
+        probability_estimator: Function which takes the board and returns a dictionary mapping hidden tile coordinates to mine probabilities
+                    (see mine_sampler.py), or None. When set, the solver guesses the tile least likely to be a mine.
+        guess_selector: Function which takes the board and returns the coordinates of the tile to guess (see lookahead.py), or None.
+                    When set, it is used for guesses before probability_estimator.
     """
-    def __init__(self, rows: int = 9, columns: int = 9, num_mines: int = 9):
+    def __init__(self, rows: int = 9, columns: int = 9, num_mines: int = 9, verbose: bool = True, seed = None, layout = None, opening_book = None,
+                 probability_estimator = None, guess_selector = None):
         """Constructor for minesweeper board.
         Arguments:
             rows: Defaults to 9, can be any integer.
             columns: Defaults to 9, can be any integer.
             num_mines: Defaults to 9, can be any integer.
+            verbose: Defaults to True, if False nothing is printed.
+            seed: Defaults to None, can be any value accepted by random.seed. Boards with the same seed have the same mines.
+            layout: Defaults to None, can be an iterable of mine coordinates (tuples) to use instead of randomly placed mines.
+            opening_book: Defaults to None, can be a BookEntry from OpeningBook.lookup.
+            probability_estimator: Defaults to None, can be an estimator such as mine_sampler.sampling_estimator().
+            guess_selector: Defaults to None, can be a selector such as lookahead.lookahead_selector().
         """
         self.rows: int = rows
         self.columns: int = columns
         self.num_mines: int = num_mines
+        self.verbose: bool = verbose
+        self.opening_book = opening_book
+        self.probability_estimator = probability_estimator
+        self.guess_selector = guess_selector
         self.placed_mines: int = 0
         self.revealed_count: int = 0
         self.the_board: List[List[Any]] = ([[[0] for _ in range(self.columns)] for _ in range(self.rows)])
         self.mine_coords = {}
         self.turn_count = 0
-        self.place_mines()
+        self.random = random.Random(seed)
+        if layout == None:
+            self.place_mines()
+        else:
+            self.place_layout(layout)
         self.update_nums()
-        self.print_board()
-        self.move_priority_queue = BinHeap((self.rows*self.columns)**2, lambda x, y: x[1] < y[1])
+        if self.verbose:
+            self.print_board()
+        self.move_priority_queue = MoveQueue(self.rows*self.columns)
         self.marked_mines = {}
         self.int_coords = []
         self.no_mines = {}
@@ -111,8 +134,8 @@ class Board:
         while self.placed_mines < self.num_mines:
 
             #Obtains random x and y integers within the row and column ranges of the game 
-            x = random.randrange(self.rows)
-            y = random.randrange(self.columns)
+            x = self.random.randrange(self.rows)
+            y = self.random.randrange(self.columns)
 
             #Ensures that a mine is not placed where a mine already exists
             if self.the_board[x][y] != [9]:
@@ -128,6 +151,21 @@ class Board:
         if one_mine == True:
             return (x,y)
         
+    def place_layout(self, layout):
+        """place_layout places mines at the specified coordinates instead of randomly.
+        Arguments:
+            layout: Iterable of coordinates (tuples) at which to place mines. Its length must be num_mines.
+        """
+
+        for each_coord in layout:
+            x, y = each_coord
+            self.the_board[x][y] = [9]
+            self.mine_coords[(x,y)] = (x,y)
+
+        self.placed_mines = len(self.mine_coords)
+        if self.placed_mines != self.num_mines:
+            raise ValueError(f"layout has {self.placed_mines} mines, expected {self.num_mines}")
+
     def indices_around_coord(self, coord, adjacent = False, only_hidden = False):
         """indices_around_coord returns the indices around a coordinate (in a 3x3 area, or directly adjacent) in the game board.
         Arguments:
@@ -298,6 +336,9 @@ class Board:
         tile_value = self.the_board[coords[0]][coords[1]][0]
 
         
+        #A revealed tile is no longer a potential play
+        self.move_priority_queue.discard(coords)
+
         if self.is_mine(coords):
             self.the_board[coords[0]][coords[1]] = "X"
         else:
@@ -337,6 +378,7 @@ class Board:
                     #Only adds to the list if not already in list of mines
                     if each_hidden not in self.marked_mines:
                         self.marked_mines[each_hidden] = None
+                        self.move_priority_queue.discard(each_hidden)
 
                 #If the coordinates for the hidden tile are within the dictionary of discovered mines, the number of discovered bombs around the integer tile is incremented by 1
                 if each_hidden in self.marked_mines:
@@ -482,12 +524,52 @@ class Board:
             
         return weight
     
-    def find_play(self):
+    def heatmap(self, estimator = None):
+        """heatmap returns the solver's assessment of every tile on the board.
+        Arguments:
+            estimator: Optional function which takes the board and returns a dictionary mapping hidden tile coordinates to
+                       mine probabilities. If provided, a "probability" column is added.
+        Returns:
+            Dictionary of columns, each a flat list with one element per tile in row-major order (index row*columns + column):
+                value: Revealed integer, 9 for a revealed mine and -1 for a hidden tile.
+                weight: tile_weight of a hidden tile, nan for a revealed tile.
+                known_safe: True if the solver determined there is no mine at the tile (no_mines).
+                known_mine: True if the solver determined there is a mine at the tile (marked_mines).
+                probability: Mine probability from the estimator, nan if it has no estimate for the tile.
+        """
+
+        columns = {"value": [], "weight": [], "known_safe": [], "known_mine": []}
+        if estimator != None:
+            probabilities = estimator(self)
+            columns["probability"] = []
+
+        for row_index, board_row in enumerate(self.the_board):
+            for column_index, board_tile in enumerate(board_row):
+                coords = (row_index, column_index)
+                revealed = type(board_tile) == int
+
+                #Weights come from tile_weight so that they always match the solver's
+                columns["value"].append(board_tile if revealed else (9 if board_tile == "X" else -1))
+                columns["weight"].append(float("nan") if revealed or board_tile == "X" else self.tile_weight(coords))
+                columns["known_safe"].append(coords in self.no_mines)
+                columns["known_mine"].append(coords in self.marked_mines)
+                if estimator != None:
+                    columns["probability"].append(probabilities.get(coords, float("nan")))
+
+        return columns
+
+    def find_play(self, excluded = None):
         """find_play loops through the priority queue of potential moves until it finds a viable play, the play is then printed for the player to execute.
+        Arguments:
+            excluded: Defaults to None, can be a collection of coordinates which must not be played (such as tiles a player flagged).
+                      Their entries are kept in the priority queue for later turns.
         Returns:
-            coords: Tuple representation of coordinates (x,y)
+            coords: Tuple representation of coordinates (x,y), or None if every playable tile is excluded.
         """
 
+        if excluded == None:
+            excluded = {}
+
         #If all mines have been discovered
         if len(self.marked_mines) == self.num_mines:
 
@@ -501,6 +583,10 @@ class Board:
                         #Inserting tile coordinates as well as its corresponding 0 weight as we know it is not a mine
                         self.move_priority_queue.insert([(row_index, column_index), 0])
 
+        #If there are no potential plays in the priority queue (an isolated area of the board), a tile has to be guessed
+        if self.move_priority_queue.find_min() == None:
+            return self.guess_move(excluded)
+
         #Recalculate the tile weight for the first tile in the priority queue
         tile_wt = self.tile_weight(self.move_priority_queue.find_min()[0])
 
@@ -512,27 +598,105 @@ class Board:
         #If the tile is already revealed, it is invalid
         #If the tile has an inconsistent weight to the weight stored in the priority queue, it is invalid
         #If the tile is contained at a location where we determined to be a mine, it is invalid
-        while (type(self.the_board[min_val[0][0]][min_val[0][1]]) == int) or (tile_wt != stored_wt and stored_wt != 0) or (min_val[0] in self.marked_mines):
+        #If the tile is excluded, it is held back and put back into the priority queue once a play is found
+        held = []
+        while (type(self.the_board[min_val[0][0]][min_val[0][1]]) == int) or (tile_wt != stored_wt and stored_wt != 0) or (min_val[0] in self.marked_mines)\
+                or (min_val[0] in excluded):
 
             #Remove the invalid tile
             self.move_priority_queue.remove_min()
 
             #If the weight is inconsistent, insert the consistent weight into the priority queue
-            if tile_wt != stored_wt:
+            if min_val[0] in excluded:
+                held.append(min_val)
+            elif tile_wt != stored_wt:
                 self.move_priority_queue.insert([min_val[0], tile_wt])
 
             #Update values to be representative of the next values within the priority queue 
             min_val = self.move_priority_queue.find_min()
+            if min_val == None:
+                for each_entry in held:
+                    self.move_priority_queue.insert(each_entry)
+                return self.guess_move(excluded)
             tile_wt = self.tile_weight(min_val[0])
             stored_wt = min_val[1]
 
+        for each_entry in held:
+            self.move_priority_queue.insert(each_entry)
+
+        #If the play is a guess and mine probabilities can be estimated, the estimated best guess is played instead
+        if stored_wt != 0 and (self.probability_estimator != None or self.guess_selector != None):
+            estimated_coords = self.estimated_guess(excluded)
+            if estimated_coords != None:
+                return estimated_coords
+
         #Print the valid play, which is least likely on the board to be a mine
-        print("SOLVER\nRow: ", min_val[0][0]+1, "Column: ", min_val[0][1]+1, "Weight: ", stored_wt)
+        if self.verbose:
+            print("SOLVER\nRow: ", min_val[0][0]+1, "Column: ", min_val[0][1]+1, "Weight: ", stored_wt)
         
         #print(self.move_priority_queue.find_min()[1])
         
         return min_val[0]
 
+    def guess_move(self, excluded = None):
+        """guess_move picks a hidden tile to play when the priority queue has no potential plays, the first hidden tile in
+        row-major order.
+        Arguments:
+            excluded: Defaults to None, can be a collection of coordinates which must not be played.
+        Returns:
+            coords: Tuple representation of coordinates (x,y), or None if every hidden tile is excluded or a discovered mine.
+        """
+
+        if excluded == None:
+            excluded = {}
+
+        #The estimated best guess is preferred when it is available
+        if self.probability_estimator != None or self.guess_selector != None:
+            estimated_coords = self.estimated_guess(excluded)
+            if estimated_coords != None:
+                return estimated_coords
+
+        #Picks the first tile which is hidden and not a discovered mine
+        for each_index in range(self.rows*self.columns):
+            coords = divmod(each_index, self.columns)
+            if type(self.the_board[coords[0]][coords[1]]) == list and coords not in self.marked_mines and coords not in excluded:
+                if self.verbose:
+                    print("SOLVER (guess)\nRow: ", coords[0]+1, "Column: ", coords[1]+1)
+                return coords
+
+    def estimated_guess(self, excluded = None):
+        """estimated_guess picks the tile chosen by the guess selector, or else the hidden tile with the lowest mine probability
+        according to the probability estimator.
+        Arguments:
+            excluded: Defaults to None, can be a collection of coordinates which must not be played.
+        Returns:
+            coords: Tuple representation of coordinates (x,y), or None if neither has an estimate for any hidden tile.
+        """
+
+        if excluded == None:
+            excluded = {}
+
+        if self.guess_selector != None:
+            coords = self.guess_selector(self)
+            if coords != None and coords not in excluded:
+                if self.verbose:
+                    print("SOLVER (lookahead)\nRow: ", coords[0]+1, "Column: ", coords[1]+1)
+                return coords
+
+        if self.probability_estimator == None:
+            return None
+
+        probabilities = self.probability_estimator(self)
+        candidates = [(probability, coords) for coords, probability in probabilities.items()
+                      if type(self.the_board[coords[0]][coords[1]]) == list and coords not in self.marked_mines and coords not in excluded]
+        if not candidates:
+            return None
+
+        probability, coords = min(candidates)
+        if self.verbose:
+            print("SOLVER (estimate)\nRow: ", coords[0]+1, "Column: ", coords[1]+1, "Mine probability: ", round(probability, 3))
+        return coords
+
     def get_player_input(self):
         """get_player_input asks the player for row and column coordinates at which a move will be executed.
         Returns:
@@ -574,6 +738,41 @@ class Board:
             
         return coords
 
+    def opening_move(self):
+        """opening_move returns the coordinates at which the first turn is played.
+        Returns:
+            Tuple representation of coordinates (x,y)
+        """
+
+        #Plays the opening book's first click if there is one
+        if self.opening_book != None:
+            return self.opening_book.first_click
+
+        return default_opening(self.rows, self.columns)
+
+    def play_turn(self, coords):
+        """play_turn executes a single turn at the specified coordinates without printing or prompting.
+        Arguments:
+            coords: Coordinates at which to execute the turn. Represented as a tuple.
+        Returns:
+            A boolean value. True if the turn hit a mine, False if it did not.
+        """
+
+        #For turn count one, it ensures that there is not a mine where the turn is executed
+        if self.turn_count == 0:
+            self.turn_one_mine_check(coords)
+
+        #Reveals tiles around the executed play
+        self.clear_path(coords)
+        self.turn_count += 1
+
+        #If a mine was hit, it is revealed on the board
+        if self.is_game_lost(coords):
+            self.reveal_turn(coords)
+            return True
+
+        return False
+
     def is_game_lost(self, coords):
         """is_game_lost 
         Arguments:
@@ -612,13 +811,15 @@ class Board:
 
         if self.is_game_lost(coords):
             self.reveal_turn(coords)
-            self.print_board()
-            print("Game over! You lost!")
+            if self.verbose:
+                self.print_board()
+                print("Game over! You lost!")
             return True
         
         elif self.is_game_won():
-            self.print_board()
-            print("Game over! You won!")
+            if self.verbose:
+                self.print_board()
+                print("Game over! You won!")
             return True
         
         else:
@@ -633,10 +834,9 @@ class Board:
         while game_over == False:
             #coords = self.get_player_input()
 
-            #For turn count one, it ensures that there is not a mine where the player executes their play
+            #For turn count one, the opening move is played
             if self.turn_count == 0:
-                coords = (4,4)
-                self.turn_one_mine_check(coords)
+                coords = self.opening_move()
 
             #If not turn number one, obtains coordinates to execute play at            
             else:
@@ -644,60 +844,73 @@ class Board:
                 coords = self.find_play()
 
             #Reveals tiles around the executed play    
-            self.clear_path(coords)
+            self.play_turn(coords)
 
             #If the game is over, return whether the game was won or lost
             if self.game_over(coords):
                 game_over = True
                 return self.is_game_won()
 
-            else:
+            elif self.verbose:
 
-                #Print the updated board and increment turn count by one
+                #Print the updated board
                 self.print_board()
-                self.turn_count += 1
                 #self.find_play()
 
-def play_minesweeper(wins, losses):
-    """play_minesweeper starts a Minesweeper game from scratch.
+def default_opening(rows, columns):
+    """default_opening returns the first move played without an opening book, (4,4) or as close to it as the board allows.
+    Returns:
+        Tuple representation of coordinates (x,y)
+    """
+
+    return (min(4, rows-1), min(4, columns-1))
+
+def play_minesweeper(wins = 0, losses = 0):
+    """play_minesweeper starts Minesweeper games from scratch until the player does not want to play again.
     Arguments:
         wins: Cumulative number of wins
         losses: Cumulative number of losses
+    Returns:
+        Tuple containing the cumulative number of wins and losses.
     """
     
-    print("Hello! This is my own implementation of minesweeper.")
-    rows = input("Please enter the number of rows you would like to have in the game board: ")
-    columns = input("Please enter the number of columns you would like to have in the game board: ")
-    mines = input("Please enter the number of mines you would like to have randomly generated across the board: ")
-
-    #The below is used for testing easy mode
-    #rows = 9
-    #columns = 9
-    #mines = 10
-
-    #Initiates the game with designated rows, columns and mine count
-    game = Board(int(rows), int(columns), int(mines))
-    
-    #print(game)
+    play_again = "y"
+
+    #Loop which starts a new game each time the player wants to play again
+    while play_again == "y":
+        print("Hello! This is my own implementation of minesweeper.")
+        rows = input("Please enter the number of rows you would like to have in the game board: ")
+        columns = input("Please enter the number of columns you would like to have in the game board: ")
+        mines = input("Please enter the number of mines you would like to have randomly generated across the board: ")
+
+        #The below is used for testing easy mode
+        #rows = 9
+        #columns = 9
+        #mines = 10
+
+        #Initiates the game with designated rows, columns and mine count
+        game = Board(int(rows), int(columns), int(mines))
+        
+        #print(game)
+
+        #Status is true if the game is over and the player won, it is False if the game is over and the player lost
+        status = game.player_turns()
+
+        #Increments wins / losses
+        if status == True:
+            wins += 1
+        else:
+            losses += 1
 
-    #Status is true if the game is over and the player won, it is False if the game is over and the player lost
-    status = game.player_turns()
+        print("wins: ", wins)
+        print("losses: ", losses)
 
-    #Increments wins / losses
-    if status == True:
-        wins += 1
-    else:
-        losses += 1
+        #Prompts player if they would like to play again, if yes, starts new game
+        play_again = input("Would you like to play again? Enter y or n: ")
 
-    print("wins: ", wins)
-    print("losses: ", losses)
+    return wins, losses
 
-    #Prompts player if they would like to play again, if yes, starts new game
-    play_again = input("Would you like to play again? Enter y or n: ")
-    if play_again == "y":
-        play_minesweeper(wins, losses)
+if __name__ == "__main__":
 
-#Starts game with initial wins/losses of 0
-wins = 0
-losses = 0
-play_minesweeper(wins, losses)
+    #Starts game with initial wins/losses of 0
+    play_minesweeper()
@@ -0,0 +1,323 @@
+import os
+import random
+import time
+from minesweeper_game import Board, default_opening
+
+def neighbour_table(rows, columns):
+    """neighbour_table precomputes the indices in a 3x3 area around every tile of a flattened board.
+    Arguments:
+        rows: Number of rows in the board.
+        columns: Number of columns in the board.
+    Returns:
+        List where element i is the list of flat indices (row*columns + column) surrounding tile i.
+    """
+
+    table = []
+    for x in range(rows):
+        for y in range(columns):
+            table.append([nx*columns + ny for nx in range(max(0, x-1), min(rows, x+2))
+                          for ny in range(max(0, y-1), min(columns, y+2)) if (nx, ny) != (x, y)])
+    return table
+
+def board_solve(rows, columns, mines, first_click):
+    """board_solve plays a board with Board's own solver (find_mines and find_play) until it would have to guess.
+
+    A move is certain if find_mines put the tile in no_mines, or if every mine has been marked.
+    Arguments:
+        rows: Number of rows in the board.
+        columns: Number of columns in the board.
+        mines: Set of flat indices containing mines.
+        first_click: Flat index of the first move.
+    Returns:
+        Set of flat indices of safe tiles that could not be revealed without guessing. Empty if the board is solvable.
+    """
+
+    board = Board(rows, columns, len(mines), verbose = False, layout = [divmod(i, columns) for i in mines])
+    lost = board.play_turn(divmod(first_click, columns))
+    while not lost and not board.is_game_won():
+        coords = board.find_play()
+        if coords not in board.no_mines and len(board.marked_mines) != board.num_mines:
+            break
+        lost = board.play_turn(coords)
+
+    #Moves are certain, so a revealed mine indicates a bug in the solver
+    assert not lost
+    return {row*columns + column for row, board_row in enumerate(board.the_board) for column, board_tile in enumerate(board_row)
+            if type(board_tile) == list and row*columns + column not in mines}
+
+def certainty_solve(rows, columns, mines, first_click, neighbours = None, use_subsets = True):
+    """certainty_solve plays a board using only moves which are certain: the single integer deductions find_mines makes,
+    the subset rule between pairs of revealed integers and the global mine count, repeated until nothing changes.
+
+    These are more deductions than Board's solver makes, which only plays a safe tile found by the latest pass of
+    find_mines and never uses the subset rule, so Board.player_turns may have to guess on boards solved this way.
+    Without use_subsets, the board is played with board_solve instead, so that Board's solver can play it.
+    Arguments:
+        rows: Number of rows in the board.
+        columns: Number of columns in the board.
+        mines: Set of flat indices containing mines.
+        first_click: Flat index of the first move.
+        neighbours: Optional table from neighbour_table, computed if not provided.
+        use_subsets: Defaults to True. If False the board is solved by board_solve.
+    Returns:
+        Set of flat indices of safe tiles that could not be revealed without guessing. Empty if the board is solvable.
+    """
+
+    if not use_subsets:
+        return board_solve(rows, columns, mines, first_click)
+
+    if neighbours == None:
+        neighbours = neighbour_table(rows, columns)
+    size = rows*columns
+    counts = [sum(1 for n in neighbours[i] if n in mines) for i in range(size)]
+    revealed = [False]*size
+    flagged = [False]*size
+    active = set()
+    revealed_count = 0
+    flag_count = 0
+
+    def reveal(start):
+        #Flood fill which reveals every tile connected to start through zeros
+        nonlocal revealed_count
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            if revealed[i] or flagged[i]:
+                continue
+            revealed[i] = True
+            revealed_count += 1
+            if counts[i] == 0:
+                stack.extend(n for n in neighbours[i] if not revealed[n])
+            else:
+                active.add(i)
+
+    reveal(first_click)
+
+    while revealed_count < size - len(mines):
+        progress = False
+        constraints = {}
+
+        #Single integer rule: an integer whose remaining mines equals zero or its number of hidden tiles
+        for i in list(active):
+            hidden = [n for n in neighbours[i] if not revealed[n] and not flagged[n]]
+            if not hidden:
+                active.discard(i)
+                continue
+            remaining = counts[i] - sum(1 for n in neighbours[i] if flagged[n])
+            if remaining == 0:
+                for n in hidden:
+                    reveal(n)
+                progress = True
+            elif remaining == len(hidden):
+                for n in hidden:
+                    if not flagged[n]:
+                        flagged[n] = True
+                        flag_count += 1
+                progress = True
+            else:
+                constraints[i] = (frozenset(hidden), remaining)
+
+        #Subset rule: if the hidden tiles of one integer contain those of another, the difference holds the difference in mines
+        if not progress:
+            by_tile = {}
+            for i, (hidden, remaining) in constraints.items():
+                for n in hidden:
+                    by_tile.setdefault(n, []).append(i)
+            for i, (hidden_a, remaining_a) in constraints.items():
+                others = set()
+                for n in hidden_a:
+                    others.update(by_tile[n])
+                others.discard(i)
+                for j in others:
+                    hidden_b, remaining_b = constraints[j]
+                    if not hidden_a < hidden_b:
+                        continue
+                    difference = hidden_b - hidden_a
+                    if remaining_b == remaining_a:
+                        for n in difference:
+                            reveal(n)
+                        progress = True
+                    elif remaining_b - remaining_a == len(difference):
+                        for n in difference:
+                            if not flagged[n]:
+                                flagged[n] = True
+                                flag_count += 1
+                        progress = True
+                if progress:
+                    break
+
+        #Global rule: once every mine is flagged the rest of the hidden tiles are safe
+        if not progress and flag_count == len(mines):
+            for i in range(size):
+                if not revealed[i] and not flagged[i]:
+                    reveal(i)
+            progress = True
+
+        if not progress:
+            break
+
+    #Deductions are certain, so a revealed mine indicates a bug in the rules above
+    assert not any(revealed[i] for i in mines)
+    return {i for i in range(size) if not revealed[i] and i not in mines}
+
+def generate_layout(rows, columns, num_mines, first_click, seed, max_repairs = 50, use_subsets = True, neighbours = None,
+                    max_attempts = 200):
+    """generate_layout produces a board that can be solved from the first click without guessing.
+
+    Layouts are sampled with a random.Random seeded with seed, keeping the 3x3 area around the first click free of
+    mines. When the certainty solve gets stuck, a mine next to the unsolved tiles is moved to a random hidden tile away
+    from them and the board is solved again. After max_repairs moves a fresh layout is sampled, up to max_attempts layouts.
+    Arguments:
+        rows, columns, num_mines: Board configuration.
+        first_click: Coordinates of the first move. Represented as a tuple.
+        seed: Seed of the layout, the same seed always produces the same board.
+        max_repairs: Defaults to 50, the number of mine moves attempted before resampling.
+        use_subsets: Passed through to certainty_solve.
+        neighbours: Optional table from neighbour_table.
+        max_attempts: Defaults to 200, the number of layouts sampled before giving up.
+    Returns:
+        Tuple containing a sorted list of mine coordinates and the number of certainty solves it took.
+    Raises:
+        ValueError: If none of the max_attempts layouts could be made solvable without guessing, as happens when the
+                    mine density is too high.
+    """
+
+    if neighbours == None:
+        neighbours = neighbour_table(rows, columns)
+    click = first_click[0]*columns + first_click[1]
+    opening = set(neighbours[click]) | {click}
+    candidates = [i for i in range(rows*columns) if i not in opening]
+    if num_mines > len(candidates):
+        raise ValueError("too many mines to keep the first click clear")
+
+    rng = random.Random(seed)
+    solves = 0
+    for _ in range(max_attempts):
+        mines = set(rng.sample(candidates, num_mines))
+        for _ in range(max_repairs + 1):
+            stuck = certainty_solve(rows, columns, mines, click, neighbours, use_subsets)
+            solves += 1
+            if not stuck:
+                return sorted(divmod(i, columns) for i in mines), solves
+
+            #Tiles on the stuck frontier, and mines which border them
+            frontier = set(stuck)
+            for i in stuck:
+                frontier.update(neighbours[i])
+            frontier_mines = [i for i in frontier if i in mines]
+            destinations = [i for i in candidates if i not in mines and i not in frontier]
+            if not frontier_mines or not destinations:
+                break
+            mines.remove(rng.choice(frontier_mines))
+            mines.add(rng.choice(destinations))
+
+    raise ValueError(f"no board without guessing found in {max_attempts} layouts of {num_mines} mines on {rows}x{columns}")
+
+def _generate_chunk(rows, columns, num_mines, first_click, seeds, max_repairs, use_subsets, max_attempts):
+    """_generate_chunk generates one board per seed inside of a worker process."""
+
+    neighbours = neighbour_table(rows, columns)
+    return [(seed,) + generate_layout(rows, columns, num_mines, first_click, seed, max_repairs, use_subsets, neighbours, max_attempts)
+            for seed in seeds]
+
+def generate_bank(rows, columns, num_mines, count, first_click = None, seed = 0, workers = None,
+                  max_repairs = 50, use_subsets = True, max_attempts = 200):
+    """generate_bank generates many no-guess boards in parallel worker processes.
+    Arguments:
+        rows, columns, num_mines: Board configuration.
+        count: Number of boards to generate.
+        first_click: Defaults to default_opening.
+        seed: Defaults to 0. Board i is generated with seed + i, so results do not depend on the number of workers.
+        workers: Number of worker processes. Defaults to os.cpu_count().
+        max_repairs, use_subsets, max_attempts: Passed through to generate_layout, which raises ValueError if a board
+                                                can not be generated.
+    Returns:
+        Dictionary containing the configuration, generated boards and throughput statistics.
+    """
+
+    if first_click == None:
+        first_click = default_opening(rows, columns)
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(seed, seed + count))
+    chunk_size = max(1, count // (workers*4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, count, chunk_size)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_generate_chunk(rows, columns, num_mines, first_click, chunk, max_repairs, use_subsets, max_attempts)
+                   for chunk in chunks]
+    else:
+        #Imported here so that worker processes and single worker runs do not pay for multiprocessing at startup
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(_generate_chunk, rows, columns, num_mines, first_click, chunk, max_repairs, use_subsets,
+                                       max_attempts)
+                       for chunk in chunks]
+            results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    boards = [board for chunk in results for board in chunk]
+    return {
+        "rows": rows,
+        "columns": columns,
+        "mines": num_mines,
+        "first_click": list(first_click),
+        "boards": [{"seed": board_seed, "mines": [list(coord) for coord in layout]} for board_seed, layout, _ in boards],
+        "solves": sum(solves for _, _, solves in boards),
+        "seconds": elapsed,
+        "workers": workers,
+        "boards_per_second_per_core": count / elapsed / workers,
+    }
+
+def export_bank(bank, path):
+    """export_bank writes a bank from generate_bank to a JSON file, leaving out the throughput statistics.
+    Arguments:
+        bank: Dictionary returned by generate_bank.
+        path: Path of the file to write.
+    """
+
+    #Imported here so that worker processes do not pay for json at startup
+    import json
+
+    keys = ("rows", "columns", "mines", "first_click", "boards")
+    with open(path, "w") as bank_file:
+        json.dump({key: bank[key] for key in keys}, bank_file, separators = (",", ":"))
+
+def load_bank(path):
+    """load_bank reads a bank written by export_bank.
+    Arguments:
+        path: Path of the file to read.
+    Returns:
+        Dictionary containing the configuration and boards. Mine coordinates are converted back to tuples.
+    """
+
+    import json
+    with open(path) as bank_file:
+        bank = json.load(bank_file)
+    bank["first_click"] = tuple(bank["first_click"])
+    for board in bank["boards"]:
+        board["mines"] = [tuple(coord) for coord in board["mines"]]
+    return bank
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description = "Generates minesweeper boards that can be solved without guessing.")
+    parser.add_argument("--rows", type = int, default = 9)
+    parser.add_argument("--columns", type = int, default = 9)
+    parser.add_argument("--mines", type = int, default = 10)
+    parser.add_argument("--count", type = int, default = 100)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--first-click", type = int, nargs = 2, default = None)
+    parser.add_argument("--max-attempts", type = int, default = 200, help = "layouts sampled per board before giving up")
+    parser.add_argument("--no-subsets", action = "store_true", help = "only keep boards Board's own solver can play without guessing")
+    parser.add_argument("--output", default = None, help = "path of a JSON board bank to export")
+    args = parser.parse_args()
+
+    bank = generate_bank(args.rows, args.columns, args.mines, args.count, args.first_click, args.seed,
+                         args.workers, use_subsets = not args.no_subsets, max_attempts = args.max_attempts)
+    print(f"{args.count} boards in {bank['seconds']:.2f}s on {bank['workers']} workers "
+          f"({bank['boards_per_second_per_core']:.1f} boards/s/core, {bank['solves']} certainty solves)")
+    if args.output:
+        export_bank(bank, args.output)
+        print(f"Exported to {args.output}")
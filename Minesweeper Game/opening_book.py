@@ -0,0 +1,163 @@
+import os
+import time
+from minesweeper_game import Board, default_opening
+
+#Default location of the opening book, next to this module
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.json")
+
+#Seed of the first simulated game, away from the seeds win_rate_benchmark plays so the book is not tuned on them
+DEFAULT_BUILD_SEED = 1000000
+
+class BookEntry:
+    """BookEntry holds the opening book for one (rows, columns, mines) configuration.
+
+    Attributes:
+        games: Number of simulated games behind each tile's win rate.
+        win_rates: Flat list (index row*columns + column) of the win rate when opening at each tile.
+        first_click: Coordinates of the first move used by Board.opening_move. Defaults to the tile with the highest win rate.
+    """
+    def __init__(self, columns: int, win_rates, games: int = 0, first_click = None):
+        self.games: int = games
+        self.win_rates = list(win_rates)
+        if first_click == None:
+            first_click = divmod(max(range(len(self.win_rates)), key = lambda index: (self.win_rates[index], -index)), columns)
+        self.first_click = first_click
+
+class OpeningBook:
+    """OpeningBook maps board configurations to their BookEntry, stored on disk as a JSON table.
+
+    Attributes:
+        entries: Dictionary mapping (rows, columns, mines) tuples to BookEntry instances.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def lookup(self, rows, columns, num_mines):
+        """lookup returns the BookEntry of a configuration, or None if the book does not cover it."""
+
+        return self.entries.get((rows, columns, num_mines))
+
+    @classmethod
+    def load(cls, path = DEFAULT_BOOK_PATH):
+        """load reads an opening book from disk. A missing file gives an empty book."""
+
+        #Imported here so that worker processes simulating games do not pay for json at startup
+        import json
+
+        book = cls()
+        if not os.path.exists(path):
+            return book
+        with open(path) as book_file:
+            table = json.load(book_file)
+        for key, entry in table.items():
+            rows, columns, num_mines = (int(part) for part in key.split(","))
+            book.entries[(rows, columns, num_mines)] = BookEntry(columns, entry["win_rates"], entry["games"], tuple(entry["first_click"]))
+        return book
+
+    def save(self, path = DEFAULT_BOOK_PATH):
+        """save writes the opening book to disk, with win rates rounded to 4 digits."""
+
+        import json
+        table = {}
+        for (rows, columns, num_mines), entry in sorted(self.entries.items()):
+            table[f"{rows},{columns},{num_mines}"] = {"games": entry.games, "first_click": list(entry.first_click),
+                                                       "win_rates": [round(rate, 4) for rate in entry.win_rates]}
+        with open(path, "w") as book_file:
+            json.dump(table, book_file, separators = (",", ":"))
+
+def symmetric_tiles(rows, columns, coords):
+    """symmetric_tiles returns the tiles equivalent to coords under the reflections (and, on square boards, rotations) of the board.
+    Returns:
+        Set of coordinate tuples, including coords itself.
+    """
+
+    x, y = coords
+    tiles = {(x, y), (rows-1-x, y), (x, columns-1-y), (rows-1-x, columns-1-y)}
+    if rows == columns:
+        tiles |= {(b, a) for a, b in tiles}
+    return tiles
+
+def _simulate_opening(rows, columns, num_mines, coords, seeds):
+    """_simulate_opening plays one seeded game per seed opening at coords, and returns the number of wins."""
+
+    entry = BookEntry(columns, [], first_click = coords)
+    wins = 0
+    for seed in seeds:
+        board = Board(rows, columns, num_mines, verbose = False, seed = seed, opening_book = entry)
+        wins += board.player_turns()
+    return wins
+
+def _simulate_openings(rows, columns, num_mines, tiles, seeds, workers):
+    """_simulate_openings returns the number of wins of each tile in tiles, played on the same seeded boards."""
+
+    if workers == 1:
+        return [_simulate_opening(rows, columns, num_mines, coords, seeds) for coords in tiles]
+
+    #Imported here so that single worker runs do not pay for multiprocessing at startup
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(_simulate_opening, rows, columns, num_mines, coords, seeds) for coords in tiles]
+        return [future.result() for future in futures]
+
+def build_entry(rows, columns, num_mines, games = 200, finalists = 5, final_games = 1000, seed = DEFAULT_BUILD_SEED, workers = 1):
+    """build_entry simulates games opening at every tile of a configuration to find the win rate of each first click.
+
+    Only one tile of each group of symmetric tiles is simulated, and every tile is played on the same seeded boards.
+    The tiles with the highest win rates are close to each other and partly ahead by luck, so the first click is
+    chosen in a second round where the finalists and the default opening play final_games fresh boards.
+    Arguments:
+        rows, columns, num_mines: Board configuration.
+        games: Defaults to 200, the number of games simulated per tile.
+        finalists: Defaults to 5, the number of tiles played again to choose the first click.
+        final_games: Defaults to 1000, the number of games played by each finalist.
+        seed: Defaults to DEFAULT_BUILD_SEED. Game i is played on the board seeded with seed + i.
+        workers: Defaults to 1, the number of worker processes.
+    Returns:
+        BookEntry for the configuration.
+    """
+
+    representatives = []
+    seen = set()
+    for x in range(rows):
+        for y in range(columns):
+            if (x, y) not in seen:
+                representatives.append((x, y))
+                seen |= symmetric_tiles(rows, columns, (x, y))
+
+    wins = _simulate_openings(rows, columns, num_mines, representatives, list(range(seed, seed + games)), workers)
+    win_rates = [0.0]*(rows*columns)
+    for coords, tile_wins in zip(representatives, wins):
+        for x, y in symmetric_tiles(rows, columns, coords):
+            win_rates[x*columns + y] = tile_wins / games
+
+    #Second round between the best tiles and the default opening, on seeds the first round did not play
+    ordered = sorted(zip(wins, representatives), key = lambda pair: (-pair[0], pair[1]))
+    tiles = [coords for _, coords in ordered[:finalists]]
+    default = default_opening(rows, columns)
+    if not symmetric_tiles(rows, columns, default) & set(tiles):
+        tiles.append(default)
+    final_wins = _simulate_openings(rows, columns, num_mines, tiles, list(range(seed + games, seed + games + final_games)), workers)
+    first_click = tiles[final_wins.index(max(final_wins))]
+
+    return BookEntry(columns, win_rates, games, first_click)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description = "Builds the opening book by simulating games opening at every tile.")
+    parser.add_argument("--config", type = int, nargs = 3, action = "append", metavar = ("ROWS", "COLUMNS", "MINES"),
+                        help = "board configuration, can be repeated (defaults to Easy)")
+    parser.add_argument("--games", type = int, default = 200)
+    parser.add_argument("--finalists", type = int, default = 5)
+    parser.add_argument("--final-games", type = int, default = 1000)
+    parser.add_argument("--seed", type = int, default = DEFAULT_BUILD_SEED)
+    parser.add_argument("--workers", type = int, default = os.cpu_count() or 1)
+    parser.add_argument("--output", default = DEFAULT_BOOK_PATH, help = "book to add the configurations to")
+    args = parser.parse_args()
+
+    book = OpeningBook.load(args.output)
+    for rows, columns, num_mines in args.config or [(9, 9, 10)]:
+        start = time.perf_counter()
+        entry = build_entry(rows, columns, num_mines, args.games, args.finalists, args.final_games, args.seed, args.workers)
+        book.entries[(rows, columns, num_mines)] = entry
+        print(f"{rows}x{columns}x{num_mines}: first click {entry.first_click} ({time.perf_counter() - start:.1f}s)")
+    book.save(args.output)
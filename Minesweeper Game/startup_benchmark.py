@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+import time
+
+#Modules which should only be imported when the engine needing them is selected
+HEAVY_MODULES = ["numpy", "pyarrow", "asyncio", "multiprocessing", "concurrent.futures.process", "argparse", "statistics", "json"]
+
+#Modules which worker processes and tools import, and the heavy modules each of them is allowed to import
+BENCHMARKED_MODULES = {
+    "minesweeper_game": [],
+    "BinaryHeap": [],
+    "no_guess_generator": [],
+    "game_server": ["asyncio", "json"],
+    "mine_sampler": [],
+    "lookahead": [],
+    "win_rate_benchmark": [],
+    "opening_book": [],
+}
+
+GAME_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+def run_python(code, importtime = False):
+    """run_python runs code in a fresh interpreter inside of the game directory, with stdin closed so that any prompt fails fast.
+    Arguments:
+        code: Python source passed to -c.
+        importtime: Defaults to False. If True, the interpreter is started with -X importtime.
+    Returns:
+        Tuple containing the completed process and the wall clock time it took in seconds.
+    """
+
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    start = time.perf_counter()
+    process = subprocess.run(command, cwd = GAME_DIRECTORY, stdin = subprocess.DEVNULL, capture_output = True, text = True, timeout = 30)
+    return process, time.perf_counter() - start
+
+def cumulative_import_time(module):
+    """cumulative_import_time returns the cumulative import time of a module in microseconds, as reported by -X importtime."""
+
+    process, _ = run_python(f"import {module}", importtime = True)
+    if process.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{process.stderr}")
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, self_time, cumulative, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        if name == module:
+            return int(cumulative)
+
+def heavy_imports(module):
+    """heavy_imports returns which of HEAVY_MODULES are loaded after importing a module."""
+
+    process, _ = run_python(f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    if process.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{process.stderr}")
+    return process.stdout.split()
+
+def median_wall_time(code, runs):
+    """median_wall_time returns the median wall clock time in seconds of running code in a fresh interpreter."""
+
+    times = sorted(run_python(code)[1] for _ in range(runs))
+    return times[len(times)//2]
+
+def startup_benchmark(runs = 15):
+    """startup_benchmark measures what importing each benchmarked module adds to interpreter start.
+    Arguments:
+        runs: Defaults to 15, the number of interpreter starts timed per module.
+    Returns:
+        Tuple containing the baseline interpreter start time in seconds and a dictionary of results per module.
+    """
+
+    #Warms the bytecode cache so that compiling the modules is not measured
+    for module in BENCHMARKED_MODULES:
+        run_python(f"import {module}")
+
+    baseline = median_wall_time("pass", runs)
+    results = {}
+    for module, allowed in BENCHMARKED_MODULES.items():
+        heavy = heavy_imports(module)
+        results[module] = {
+            "import_us": cumulative_import_time(module),
+            "added_ms": (median_wall_time(f"import {module}", runs) - baseline)*1000,
+            "unexpected_heavy_imports": [m for m in heavy if m not in allowed],
+        }
+    return baseline, results
+
+if __name__ == "__main__":
+    baseline, results = startup_benchmark()
+    print(f"interpreter start: {baseline*1000:.1f} ms")
+    failed = False
+    for module, result in results.items():
+        print(f"{module}: import {result['import_us']/1000:.2f} ms (-X importtime), +{result['added_ms']:.1f} ms wall clock")
+        if result["unexpected_heavy_imports"]:
+            failed = True
+            print(f"    imports heavy modules at load: {', '.join(result['unexpected_heavy_imports'])}")
+    sys.exit(1 if failed else 0)
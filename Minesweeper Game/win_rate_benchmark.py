@@ -0,0 +1,286 @@
+import math
+import os
+import time
+from minesweeper_game import Board
+
+def play_heuristic(rows, columns, num_mines, seed):
+    """play_heuristic plays one seeded game with the solver built into Board.
+    Returns:
+        A boolean value. True if the game was won.
+    """
+
+    game = Board(rows, columns, num_mines, verbose = False, seed = seed)
+    return game.player_turns()
+
+_opening_book = None
+
+def play_opening_book(rows, columns, num_mines, seed):
+    """play_opening_book plays one seeded game with the solver built into Board, using the default opening book.
+    Returns:
+        A boolean value. True if the game was won.
+    """
+
+    #The book is loaded once per process, and only when this solver is selected
+    global _opening_book
+    if _opening_book == None:
+        from opening_book import OpeningBook
+        _opening_book = OpeningBook.load()
+
+    entry = _opening_book.lookup(rows, columns, num_mines)
+    game = Board(rows, columns, num_mines, verbose = False, seed = seed, opening_book = entry)
+    return game.player_turns()
+
+def play_sampling(rows, columns, num_mines, seed):
+    """play_sampling plays one seeded game with the solver built into Board, guessing with mine_sampler's estimates.
+    Returns:
+        A boolean value. True if the game was won.
+    """
+
+    #Imported here so that NumPy is only needed when this solver is selected
+    from mine_sampler import sampling_estimator
+
+    game = Board(rows, columns, num_mines, verbose = False, seed = seed, probability_estimator = sampling_estimator(seed = seed))
+    return game.player_turns()
+
+def play_lookahead(rows, columns, num_mines, seed):
+    """play_lookahead plays one seeded game with the solver built into Board, guessing with two ply lookahead.
+    Returns:
+        A boolean value. True if the game was won.
+    """
+
+    #Imported here so that NumPy is only needed when this solver is selected
+    from lookahead import lookahead_selector
+
+    game = Board(rows, columns, num_mines, verbose = False, seed = seed, guess_selector = lookahead_selector(seed = seed))
+    return game.player_turns()
+
+#Solver variants which can be benchmarked, mapping a name to a function playing one seeded game
+SOLVERS = {
+    "heuristic": play_heuristic,
+    "opening_book": play_opening_book,
+    "sampling": play_sampling,
+    "lookahead": play_lookahead,
+}
+
+def play_game(solver, rows, columns, num_mines, seed):
+    """play_game plays one seeded game with a solver variant. Errors raised by the solver are not caught, so a crashing
+    solver stops the benchmark instead of being counted as losing.
+    Returns:
+        A boolean value. True if the game was won.
+    """
+
+    return bool(SOLVERS[solver](rows, columns, num_mines, seed))
+
+def _play_batch(solver, rows, columns, num_mines, seeds):
+    """_play_batch plays one game per seed, used as the unit of work in worker processes."""
+
+    return [play_game(solver, rows, columns, num_mines, seed) for seed in seeds]
+
+def wilson_interval(wins, games, confidence = 0.95):
+    """wilson_interval returns the Wilson score interval of a win rate.
+    Arguments:
+        wins: Number of games won.
+        games: Number of games played.
+        confidence: Defaults to 0.95.
+    Returns:
+        Tuple containing the lower and upper bound of the interval.
+    """
+
+    if games == 0:
+        return (0.0, 1.0)
+
+    #Imported here since statistics imports decimal and fractions, which only the parent process needs
+    from statistics import NormalDist
+    z = NormalDist().inv_cdf(0.5 + confidence/2)
+    rate = wins / games
+    denominator = 1 + z*z/games
+    centre = (rate + z*z/(2*games)) / denominator
+    margin = z*math.sqrt(rate*(1 - rate)/games + z*z/(4*games*games)) / denominator
+    return (max(0.0, centre - margin), min(1.0, centre + margin))
+
+class BatchRunner:
+    """BatchRunner plays batches of seeded games, in worker processes if more than one worker is requested.
+
+    Attributes:
+        workers: Number of worker processes, 1 plays in the current process.
+    """
+    def __init__(self, workers: int = 1):
+        self.workers: int = workers or os.cpu_count() or 1
+        self._executor = None
+        if self.workers > 1:
+            #Imported here so that single worker runs do not pay for multiprocessing at startup
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(self.workers)
+
+    def play(self, solver, rows, columns, num_mines, seeds):
+        """play plays one game per seed and returns whether each game was won, in seed order."""
+
+        if self._executor == None:
+            return _play_batch(solver, rows, columns, num_mines, seeds)
+        chunk_size = max(1, math.ceil(len(seeds) / self.workers))
+        futures = [self._executor.submit(_play_batch, solver, rows, columns, num_mines, seeds[i:i + chunk_size])
+                   for i in range(0, len(seeds), chunk_size)]
+        return [result for future in futures for result in future.result()]
+
+    def close(self):
+        """close shuts down the worker processes."""
+
+        if self._executor != None:
+            self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def adaptive_win_rate(rows, columns, num_mines, solver = "heuristic", width = 0.05, confidence = 0.95,
+                      batch_size = 100, max_games = 100000, seed = 0, runner = None):
+    """adaptive_win_rate plays batches of games until the Wilson interval of the win rate is narrower than width.
+    Arguments:
+        rows, columns, num_mines: Board configuration.
+        solver: Defaults to "heuristic", a key of SOLVERS.
+        width: Defaults to 0.05, the requested width of the interval (upper bound minus lower bound).
+        confidence: Defaults to 0.95.
+        batch_size: Defaults to 100, the number of games played between checks of the interval.
+        max_games: Defaults to 100000, the number of games after which the benchmark stops regardless of width.
+        seed: Defaults to 0. Game i is played on the board seeded with seed + i.
+        runner: Optional BatchRunner, games are played in the current process if not provided.
+    Returns:
+        Dictionary report of the configuration, counts, interval and why the benchmark stopped.
+    """
+
+    runner = runner or BatchRunner(1)
+    wins = games = 0
+    interval = (0.0, 1.0)
+    start = time.perf_counter()
+
+    while interval[1] - interval[0] >= width and games < max_games:
+        seeds = list(range(seed + games, seed + min(games + batch_size, max_games)))
+        wins += sum(runner.play(solver, rows, columns, num_mines, seeds))
+        games += len(seeds)
+        interval = wilson_interval(wins, games, confidence)
+
+    return {
+        "rows": rows,
+        "columns": columns,
+        "mines": num_mines,
+        "solver": solver,
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else None,
+        "interval": list(interval),
+        "confidence": confidence,
+        "requested_width": width,
+        "stopped": "width" if interval[1] - interval[0] < width else "max_games",
+        "seconds": time.perf_counter() - start,
+    }
+
+def paired_comparison(rows, columns, num_mines, solver_a, solver_b, delta = 0.05, alpha = 0.05, beta = 0.1,
+                      batch_size = 100, max_games = 100000, seed = 0, runner = None):
+    """paired_comparison plays two solver variants on the same seeded boards until a sequential test decides between them.
+
+    Only boards where exactly one of the variants wins carry information. On those boards, a Wald sequential
+    probability ratio test is run in each direction, testing whether variant A wins them with probability 0.5
+    against 0.5 + delta (A is better) and 0.5 - delta (B is better), with alpha split between the two directions.
+    The win rates can differ by at most the share of discordant boards, so the comparison also stops with no difference
+    once the Wilson upper bound on that share is below delta.
+    Arguments:
+        rows, columns, num_mines: Board configuration.
+        solver_a, solver_b: Keys of SOLVERS.
+        delta: Defaults to 0.05. Used both as the shift from 0.5 tested on discordant boards and as the largest win rate
+               difference counted as no difference.
+        alpha: Defaults to 0.05, the false positive rate.
+        beta: Defaults to 0.1, the false negative rate.
+        batch_size, max_games, seed, runner: As in adaptive_win_rate.
+    Returns:
+        Dictionary report with a "decision" of "a_better", "b_better", "no_difference" or "inconclusive".
+    """
+
+    runner = runner or BatchRunner(1)
+    upper = math.log((1 - beta) / (alpha/2))
+    lower = math.log(beta / (1 - alpha/2))
+    step_win = math.log(1 + 2*delta)
+    step_loss = math.log(1 - 2*delta)
+    games = wins_a = wins_b = only_a = only_b = 0
+    decision = "inconclusive"
+    start = time.perf_counter()
+
+    while games < max_games:
+        seeds = list(range(seed + games, seed + min(games + batch_size, max_games)))
+        results_a = runner.play(solver_a, rows, columns, num_mines, seeds)
+        results_b = runner.play(solver_b, rows, columns, num_mines, seeds)
+        for won_a, won_b in zip(results_a, results_b):
+            wins_a += won_a
+            wins_b += won_b
+            only_a += won_a and not won_b
+            only_b += won_b and not won_a
+        games += len(seeds)
+
+        #Log likelihood ratios of "A is better" and "B is better" against "no difference"
+        ratio_a = only_a*step_win + only_b*step_loss
+        ratio_b = only_b*step_win + only_a*step_loss
+        if ratio_a >= upper:
+            decision = "a_better"
+            break
+        elif ratio_b >= upper:
+            decision = "b_better"
+            break
+        elif (ratio_a <= lower and ratio_b <= lower) or wilson_interval(only_a + only_b, games, 1 - alpha)[1] < delta:
+            decision = "no_difference"
+            break
+
+    return {
+        "rows": rows,
+        "columns": columns,
+        "mines": num_mines,
+        "solver_a": solver_a,
+        "solver_b": solver_b,
+        "games": games,
+        "wins_a": wins_a,
+        "wins_b": wins_b,
+        "only_a_won": only_a,
+        "only_b_won": only_b,
+        "delta": delta,
+        "alpha": alpha,
+        "beta": beta,
+        "decision": decision,
+        "seconds": time.perf_counter() - start,
+    }
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description = "Benchmarks solver win rates, stopping once the result is precise enough.")
+    parser.add_argument("--config", type = int, nargs = 3, action = "append", metavar = ("ROWS", "COLUMNS", "MINES"),
+                        help = "board configuration, can be repeated (defaults to Easy, Medium and Expert)")
+    parser.add_argument("--solver", default = "heuristic", choices = sorted(SOLVERS))
+    parser.add_argument("--compare", nargs = 2, default = None, choices = sorted(SOLVERS), metavar = ("SOLVER_A", "SOLVER_B"))
+    parser.add_argument("--width", type = float, default = 0.05)
+    parser.add_argument("--confidence", type = float, default = 0.95)
+    parser.add_argument("--delta", type = float, default = 0.05)
+    parser.add_argument("--batch-size", type = int, default = 100)
+    parser.add_argument("--max-games", type = int, default = 100000)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--workers", type = int, default = 1)
+    parser.add_argument("--output", default = None, help = "path of a JSON lines report, printed if not provided")
+    args = parser.parse_args()
+
+    configs = args.config or [(9, 9, 10), (16, 16, 40), (16, 30, 99)]
+    reports = []
+    with BatchRunner(args.workers) as runner:
+        for rows, columns, num_mines in configs:
+            if args.compare:
+                reports.append(paired_comparison(rows, columns, num_mines, args.compare[0], args.compare[1], args.delta,
+                                                 round(1 - args.confidence, 6), batch_size = args.batch_size,
+                                                 max_games = args.max_games, seed = args.seed, runner = runner))
+            else:
+                reports.append(adaptive_win_rate(rows, columns, num_mines, args.solver, args.width, args.confidence,
+                                                 args.batch_size, args.max_games, args.seed, runner))
+
+    lines = "\n".join(json.dumps(report) for report in reports)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(lines + "\n")
+    else:
+        print(lines)